@@ -1,8 +1,12 @@
-import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
-import pandas as pd
-from matplotlib import pyplot as plt
+
+# Allow importing the shared helpers from the machines directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import common
 
 # Disclaimer:
 # There are almost no sources concerning energy consumption of batch mixers used in the glass industry
@@ -62,52 +66,62 @@ production_duration = mixing_percentage * DATA_POINTS
 material_amount = PRODUCTION_QUANTITY / PRODUCTION_YIELD
 batch_size = MIXING_TIME * material_amount / production_duration
 
-def generate_data(machine_number, is_faulty):
-    # Create a production segment
-    if machine_number % 2 == 0:
-        production_segment = [batch_size] * MIXING_TIME
-        production_segment.extend([0] * TRANSFER_TIME)
-    else:
-        production_segment = [0.0] * TRANSFER_TIME
-        production_segment.extend([batch_size] * MIXING_TIME)
+def create_production_series(production_segment):
+    # Full cycles are written through a 2D view of the series, the remaining points take the start of the segment
+    full_cycles, remaining_points = divmod(DATA_POINTS, cycle_time)
+    production_series = np.empty(DATA_POINTS, dtype=np.float32)
+    production_series[:full_cycles * cycle_time].reshape(full_cycles, cycle_time)[:] = production_segment
+    production_series[full_cycles * cycle_time:] = production_segment[:remaining_points]
+    return production_series
 
-    # Create the production time series
-    production_repetition = math.ceil(DATA_POINTS / cycle_time)
-    production_series = np.tile(production_segment, production_repetition)
-    production_series = production_series[:DATA_POINTS]
+# Create the production time series
+# These do not depend on the machine besides its parity, so they are only created once
+# Odd machines are offset by the transfer time, so the two mixers alternate
+production_segment = np.zeros(cycle_time, dtype=np.float32)
+production_segment[:MIXING_TIME] = batch_size
+even_production_series = create_production_series(production_segment)
+odd_production_series = create_production_series(np.roll(production_segment, TRANSFER_TIME))
 
-    # Introduce variability to production
-    np.random.seed(48 + machine_number)
-    variable_production = np.random.normal(production_series, production_series * VARIABILITY)
+target_x = np.linspace(0, HOURS_PER_DAY, num=DATA_POINTS, endpoint=False)
 
-    # Calculate power consumption
-    power_consumption = variable_production * MIXER_POWER * WATTS_PER_KILOWATT
+def generate_data(machine_number, is_faulty):
+    production_series = odd_production_series if machine_number % 2 == 1 else even_production_series
 
-    if is_faulty:
-        power_consumption *= 1 + FAULT_EXCESS
+    # Introduce variability to production and calculate power consumption
+    # Every step is done in place on the noise buffer, so no intermediate arrays are created
+    power_factor = MIXER_POWER * WATTS_PER_KILOWATT * (1 + FAULT_EXCESS if is_faulty else 1)
+    rng = np.random.default_rng(48 + machine_number)
+    power_consumption = rng.standard_normal(DATA_POINTS, dtype=np.float32)
+    power_consumption *= VARIABILITY
+    power_consumption += 1
+    power_consumption *= production_series
+    power_consumption *= power_factor
 
-    power_consumption = np.round(power_consumption).astype(int)
+    power_consumption = np.rint(power_consumption, out=power_consumption).astype(np.int32)
 
     # Save to CSV
-    df = pd.DataFrame({"ActivePower": power_consumption})
-    df.to_csv(f"batch_mixer{machine_number}{'_faulty' if is_faulty else ''}.csv", index=False)
-
-    # Visualize
-    target_x = np.linspace(0, HOURS_PER_DAY, num=DATA_POINTS, endpoint=False)
-    plt.figure(figsize=(12, 5))
-    plt.plot(target_x, df['ActivePower'])
-    plt.title(f"Batch Mixer {machine_number} Power Consumption")
-    plt.xlabel("Hour of Day")
-    plt.ylabel("Power Consumption (W)")
-    plt.grid(True)
-    plt.tight_layout()
-    plt.show()
+    file_name = f"batch_mixer{machine_number}{'_faulty' if is_faulty else ''}.csv"
+    common.save_data(file_name, power_consumption)
 
     print(f"Batch mixer {machine_number} CSV file generated successfully.")
 
-i = 0
+    return power_consumption
 
-for i in range(NUMBER_OF_MACHINES):
-    generate_data(i, False)
+if __name__ == "__main__":
+    # Every machine has its own seed and output file, so the machines are generated in parallel
+    # The machine after the regular ones is generated as the faulty one
+    machine_numbers = range(NUMBER_OF_MACHINES + 1)
+    faulty_machines = [machine_number == NUMBER_OF_MACHINES for machine_number in machine_numbers]
+
+    plot = common.parse_arguments().plot
+
+    with ProcessPoolExecutor() as executor:
+        power_consumptions = list(executor.map(generate_data, machine_numbers, faulty_machines))
+
+    # Visualize
+    # The plots are created here rather than in the worker processes, and are shown together at the end
+    if plot:
+        for machine_number, power_consumption in zip(machine_numbers, power_consumptions):
+            common.plot_data(target_x, power_consumption, f"Batch Mixer {machine_number} Power Consumption")
 
-generate_data(i + 1, True)
\ No newline at end of file
+        common.show_plots()
@@ -0,0 +1,48 @@
+import argparse
+
+import numpy as np
+
+# Shared helpers for the machine data generation scripts
+# The scripts only differ in their constants, so the generation, saving and plotting steps are done here
+
+def parse_arguments():
+    # Plotting is skipped by default, so the CSV files can be generated without waiting on plot windows
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--plot", action="store_true", help="plot the generated data once all files are saved")
+    return parser.parse_args()
+
+def generate_gaussian_loads(seed, machine_count, data_points, production_quantity, production_variability,
+                            power_factor):
+    # Map production throughout the day with variability and calculate power consumption
+    # The noise of every machine is drawn at once from a single generator, with one row per machine
+    # The power factor is applied to the mean and deviation, so the noise only needs to be scaled and offset once
+    # The power factor can also be given as a column with one value per machine
+    rng = np.random.default_rng(seed)
+    spread_power = production_quantity / data_points * power_factor
+    power_consumption = rng.standard_normal((machine_count, data_points), dtype=np.float32)
+    power_consumption *= spread_power * production_variability
+    power_consumption += spread_power
+    return power_consumption
+
+def save_data(file_name, power_consumption):
+    # The data is a single integer column, so it is formatted directly and written in a single call
+    with open(file_name, "w") as file:
+        file.write("ActivePower\n" + "\n".join(map(str, power_consumption.tolist())) + "\n")
+
+def plot_data(target_x, power_consumption, title):
+    # Matplotlib is only imported when plotting, since importing it takes longer than generating the data
+    from matplotlib import pyplot as plt
+
+    plt.figure(figsize=(12, 5))
+    plt.plot(target_x, power_consumption)
+    plt.title(title)
+    plt.xlabel("Hour of Day")
+    plt.ylabel("Power Consumption (W)")
+    plt.grid(True)
+    plt.tight_layout()
+
+def show_plots():
+    # All figures are shown together, so one window does not block the generation of the next file
+    from matplotlib import pyplot as plt
+
+    plt.show()
@@ -1,6 +1,11 @@
+import os
+import sys
+
 import numpy as np
-import pandas as pd
-from matplotlib import pyplot as plt
+
+# Allow importing the shared helpers from the machines directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import common
 
 # Disclaimer:
 # There are nearly no sources concerning the energy consumption of glass forehearths
@@ -63,41 +68,38 @@ GLASS_CONSUMPTION = 0.25
 # Unit: Degrees Celsius (°C)
 TEMPERATURE_DROP = 50
 
-def generate_data(machine_number, is_faulty):
-    # Map production throughout the day with variability
-    np.random.seed(48 + machine_number)
-    spread_production = PRODUCTION_QUANTITY / DATA_POINTS
-    production_series = np.random.normal(spread_production, spread_production * PRODUCTION_VARIABILITY, DATA_POINTS)
-
-    # Calculate power consumption
-    power_consumption = (1 + FOREHEARTH_AGE * AGING_FACTOR) * WATTS_PER_KILOWATT * (
-            production_series * GLASS_CONSUMPTION * TEMPERATURE_DROP * DATA_POINTS / HOURS_PER_DAY)
+# Calculate the power drawn per ton of glass produced in a data point
+# All scalar factors are combined once, so the series only needs a single multiplication
+power_factor = ((1 + FOREHEARTH_AGE * AGING_FACTOR) * GLASS_CONSUMPTION * TEMPERATURE_DROP *
+                DATA_POINTS / HOURS_PER_DAY * WATTS_PER_KILOWATT)
 
-    if is_faulty:
-        power_consumption *= 1 + FAULT_EXCESS
+target_x = np.linspace(0, HOURS_PER_DAY, num=DATA_POINTS, endpoint=False)
 
-    power_consumption = np.round(power_consumption).astype(int)
+def generate_data(plot):
+    # One row is generated per machine, the machine after the regular ones is generated as the faulty one
+    # The fault excess is included in the power factor of each machine, so all rows are scaled in the same pass
+    machine_power_factors = np.full((NUMBER_OF_MACHINES + 1, 1), power_factor, dtype=np.float32)
+    machine_power_factors[NUMBER_OF_MACHINES] *= 1 + FAULT_EXCESS
+    power_consumption = common.generate_gaussian_loads(48, NUMBER_OF_MACHINES + 1, DATA_POINTS, PRODUCTION_QUANTITY,
+                                                       PRODUCTION_VARIABILITY, machine_power_factors)
+    power_consumption = np.rint(power_consumption, out=power_consumption).astype(np.int32)
 
-    # Save to CSV
-    df = pd.DataFrame({"ActivePower": power_consumption})
-    df.to_csv(f"forehearth{machine_number}{'_faulty' if is_faulty else ''}.csv", index=False)
+    for machine_number, machine_power_consumption in enumerate(power_consumption):
+        is_faulty = machine_number == NUMBER_OF_MACHINES
 
-    # Visualize
-    target_x = np.linspace(0, HOURS_PER_DAY, num=DATA_POINTS, endpoint=False)
-    plt.figure(figsize=(12, 5))
-    plt.plot(target_x, df['ActivePower'])
-    plt.title(f"Forehearth {machine_number} Power Consumption")
-    plt.xlabel("Hour of Day")
-    plt.ylabel("Power Consumption (W)")
-    plt.grid(True)
-    plt.tight_layout()
-    plt.show()
+        # Save to CSV
+        file_name = f"forehearth{machine_number}{'_faulty' if is_faulty else ''}.csv"
+        common.save_data(file_name, machine_power_consumption)
 
-    print(f"Forehearth {machine_number} CSV file generated successfully.")
+        # Visualize
+        if plot:
+            title = f"Forehearth {machine_number} Power Consumption"
+            common.plot_data(target_x, machine_power_consumption, title)
 
-i = 0
+        print(f"Forehearth {machine_number} CSV file generated successfully.")
 
-for i in range(NUMBER_OF_MACHINES):
-    generate_data(i, False)
+    if plot:
+        common.show_plots()
 
-generate_data(i + 1, True)
\ No newline at end of file
+if __name__ == "__main__":
+    generate_data(common.parse_arguments().plot)
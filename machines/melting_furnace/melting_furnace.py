@@ -1,6 +1,11 @@
+import os
+import sys
+
 import numpy as np
-import pandas as pd
-from matplotlib import pyplot as plt
+
+# Allow importing the shared helpers from the machines directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import common
 
 # Disclaimer:
 # There are very few sources concerning the details about the energy consumption of glass melting furnaces
@@ -64,29 +69,25 @@ CULLET_AMOUNT = 0.4
 # Unit: Percentage as a decimal (0 to 1)
 CULLET_SAVINGS = 0.0025
 
-# Map production throughout the day with variability
-np.random.seed(48)
-spread_production = PRODUCTION_QUANTITY / DATA_POINTS
-production_series = np.random.normal(spread_production, spread_production * PRODUCTION_VARIABILITY, DATA_POINTS)
+# Calculate the power drawn per ton of glass produced in a data point
+# All scalar factors are combined once, so the series only needs a single multiplication
+power_factor = ((1 + FURNACE_AGE * AGING_FACTOR) * GLASS_CONSUMPTION * DATA_POINTS / HOURS_PER_DAY *
+                (1 - DECIMAL_TO_PERCENTAGE * CULLET_AMOUNT * CULLET_SAVINGS) * WATTS_PER_KILOWATT)
+
+plot = common.parse_arguments().plot
 
 # Calculate power consumption
-power_consumption = np.round((1 + FURNACE_AGE * AGING_FACTOR) * (
-        production_series * GLASS_CONSUMPTION * DATA_POINTS / HOURS_PER_DAY *
-        (1 - DECIMAL_TO_PERCENTAGE * CULLET_AMOUNT * CULLET_SAVINGS)) * WATTS_PER_KILOWATT).astype(int)
+power_consumption = common.generate_gaussian_loads(48, 1, DATA_POINTS, PRODUCTION_QUANTITY,
+                                                   PRODUCTION_VARIABILITY, power_factor)[0]
+power_consumption = np.rint(power_consumption, out=power_consumption).astype(np.int32)
 
 # Save to CSV
-df = pd.DataFrame({"ActivePower": power_consumption})
-df.to_csv("melting_furnace.csv", index=False)
+common.save_data("melting_furnace.csv", power_consumption)
+
+print(f"Melting furnace CSV file generated successfully.")
 
 # Visualize
-target_x = np.linspace(0, HOURS_PER_DAY, num=DATA_POINTS, endpoint=False)
-plt.figure(figsize=(12, 5))
-plt.plot(target_x, df['ActivePower'])
-plt.title("Melting Furnace Power Consumption")
-plt.xlabel("Hour of Day")
-plt.ylabel("Power Consumption (W)")
-plt.grid(True)
-plt.tight_layout()
-plt.show()
-
-print(f"Melting furnace CSV file generated successfully.")
\ No newline at end of file
+if plot:
+    target_x = np.linspace(0, HOURS_PER_DAY, num=DATA_POINTS, endpoint=False)
+    common.plot_data(target_x, power_consumption, "Melting Furnace Power Consumption")
+    common.show_plots()
@@ -1,7 +1,7 @@
+import argparse
+import functools
+
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-from scipy.interpolate import PchipInterpolator
 
 HOURS_PER_DAY = 24
 
@@ -39,7 +39,7 @@ STANDARD_IRRADIANCE = 1000
 HOURLY_GTI = np.array([
     0.0, 0.0, 0.0, 0.0, 1.69, 19.98, 55.87, 180.09, 341.57, 489.86, 632.75, 721.39,
     741.11, 722.58, 647.72, 527.44, 384.08, 239.04, 97.32, 37.89, 9.11, 0.0, 0.0, 0.0
-])
+], dtype=np.float32)
 
 # Performance Ratio
 # An overall metric of how efficient the solar system is after accounting for real-world energy losses
@@ -54,32 +54,105 @@ HOURLY_GTI = np.array([
 # Unit: Percentage as a decimal (0 to 1)
 PERFORMANCE_RATIO = 0.8
 
-# Perform PCHIP interpolation on GTI data to reach the resolution given by DATA_POINTS
-# PCHIP interpolation is used since the data follows a bell curve, and it provides more accurate values
-original_x = np.linspace(0, HOURS_PER_DAY, num=len(HOURLY_GTI), endpoint=False)
-target_x = np.linspace(0, HOURS_PER_DAY, num=DATA_POINTS, endpoint=False)
-pchip = PchipInterpolator(original_x, HOURLY_GTI)
-interpolated_gti = pchip(target_x)
-
-# Add variability to the data
-np.random.seed(48)
-variable_gti = np.random.normal(interpolated_gti, interpolated_gti * VARIABILITY)
-
-# Calculate power production
-power_production = PANEL_POWER * (variable_gti / STANDARD_IRRADIANCE) * PERFORMANCE_RATIO
-
-# Save to CSV
-df = pd.DataFrame({"ActivePower": power_production})
-df.to_csv("solar_panel.csv", index=False)
-
-# Visualize
-plt.figure(figsize=(12, 5))
-plt.plot(target_x, df['ActivePower'])
-plt.title("Solar Panel Power Production")
-plt.xlabel("Hour of Day")
-plt.ylabel("Power Production (W)")
-plt.grid(True)
-plt.tight_layout()
-plt.show()
-
-print(f"Solar panel CSV file generated successfully.")
+def edge_slope(first_secant, second_secant):
+    # One-sided estimate of the slope at either end of the data, limited so the curve keeps its shape
+    slope = (3 * first_secant - second_secant) / 2
+    if np.sign(slope) != np.sign(first_secant):
+        return 0.0
+    if np.sign(first_secant) != np.sign(second_secant) and abs(slope) > 3 * abs(first_secant):
+        return 3 * first_secant
+    return slope
+
+@functools.lru_cache(maxsize=None)
+def interpolate_gti():
+    # The interpolation only depends on constants, so it is only calculated once per process
+    # Perform PCHIP interpolation on GTI data to reach the resolution given by DATA_POINTS
+    # PCHIP interpolation is used since the data follows a bell curve, and it provides more accurate values
+    # The slopes at each hour are calculated with the Fritsch-Carlson method, like SciPy's PchipInterpolator
+    hour_step = HOURS_PER_DAY / len(HOURLY_GTI)
+    secants = np.diff(HOURLY_GTI) / hour_step
+
+    # Inner slopes are the harmonic mean of the neighbouring secants, or zero at peaks and flat sections
+    slopes = np.zeros_like(HOURLY_GTI)
+    monotonic = secants[:-1] * secants[1:] > 0
+    slopes[1:-1][monotonic] = 2 / (1 / secants[:-1][monotonic] + 1 / secants[1:][monotonic])
+    slopes[0] = edge_slope(secants[0], secants[1])
+    slopes[-1] = edge_slope(secants[-1], secants[-2])
+
+    # Calculate the cubic coefficients of each hourly segment, from the highest to the lowest order
+    curvature = (slopes[:-1] + slopes[1:] - 2 * secants) / hour_step
+    segment_coefficients = np.array([
+        curvature / hour_step, (secants - slopes[:-1]) / hour_step - curvature, slopes[:-1], HOURLY_GTI[:-1]
+    ])
+
+    # Evaluate the interpolation directly from the cubic coefficients of each hourly segment
+    # Both grids are evenly spaced, so the segment of each data point is found from its index instead of a search
+    # The time of each data point is never stored, only its offset from the start of its segment
+    # Points after the last hour belong to the last segment, which is extrapolated in the same way as the interpolator
+    point_index = np.arange(DATA_POINTS)
+    segment = np.minimum(point_index * len(HOURLY_GTI) // DATA_POINTS, len(HOURLY_GTI) - 2)
+    offset = (point_index * len(HOURLY_GTI) - segment * DATA_POINTS).astype(np.float32)
+    offset *= hour_step / DATA_POINTS
+    coefficients = segment_coefficients[:, segment]
+
+    # The polynomial is evaluated in Horner form, in place on a single buffer
+    interpolated_gti = coefficients[0] * offset
+    interpolated_gti += coefficients[1]
+    interpolated_gti *= offset
+    interpolated_gti += coefficients[2]
+    interpolated_gti *= offset
+    interpolated_gti += coefficients[3]
+
+    # The cached array is shared between calls, so it is made read-only
+    interpolated_gti.flags.writeable = False
+    return interpolated_gti
+
+def compute_power_production(seed=48, panel_power=PANEL_POWER, performance_ratio=PERFORMANCE_RATIO,
+                             variability=VARIABILITY, days=1):
+    interpolated_gti = interpolate_gti()
+
+    # Calculate the power produced per unit of irradiance
+    # All scalar factors are combined once, so the irradiance only needs a single multiplication
+    power_factor = panel_power * performance_ratio / STANDARD_IRRADIANCE
+
+    # Add variability to the data and calculate power production
+    # The noise of every day is drawn at once, with one row per day sharing the same interpolated GTI
+    # Every step is done in place on the noise buffer, so no intermediate arrays are created
+    rng = np.random.default_rng(seed)
+    power_production = rng.standard_normal((days, DATA_POINTS), dtype=np.float32)
+    power_production *= variability * power_factor
+    power_production += power_factor
+    power_production *= interpolated_gti
+    return power_production
+
+def main():
+    # Plotting is skipped by default, so the CSV file can be generated without waiting on the plot window
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--plot", action="store_true", help="plot the generated data once the file is saved")
+    parser.add_argument("--days", type=int, default=1, help="number of consecutive days to generate")
+    arguments = parser.parse_args()
+
+    # The days are saved one after another as a single series
+    power_production = compute_power_production(days=arguments.days).ravel()
+
+    # Save to CSV
+    np.savetxt("solar_panel.csv", power_production, fmt="%.3f", header="ActivePower", comments="")
+
+    print(f"Solar panel CSV file generated successfully.")
+
+    # Visualize
+    if arguments.plot:
+        import matplotlib.pyplot as plt
+
+        target_x = np.linspace(0, arguments.days * HOURS_PER_DAY, num=power_production.size, endpoint=False)
+        plt.figure(figsize=(12, 5))
+        # A thin line without antialiasing is enough to inspect the data, and renders faster over many days
+        plt.plot(target_x, power_production, linewidth=0.5, antialiased=False)
+        plt.title("Solar Panel Power Production")
+        plt.xlabel("Hour of Day" if arguments.days == 1 else "Hour")
+        plt.ylabel("Power Production (W)")
+        plt.grid(True)
+        plt.show()
+
+if __name__ == "__main__":
+    main()